@@ -0,0 +1,793 @@
+"""Natural (TimSort-style) merge sort with the same contract as q5's ``merge_sort``.
+
+``merge_sort(arr)`` sorts the list ``arr`` in place and returns ``None``, just
+like the kernel in ``__encoded_files__/q5.encoded.pyc``.  Instead of always
+splitting the list in half, it scans for runs that are already in order
+(non-descending runs are kept, strictly descending runs are reversed in
+place), extends short runs with binary insertion sort and merges neighbouring
+runs with galloping.  Already-sorted and reverse-sorted inputs therefore take
+``n - 1`` comparisons, nearly-sorted inputs close to linear time, and random
+inputs stay ``O(n log n)``.  The sort is stable and only uses ``<``.
+
+``key`` and ``reverse`` behave as for ``list.sort``: ``key`` is called once per
+item and the keys are sorted in lockstep with the items, without building
+decorated tuples.  When every item (or key) is a plain int or a float, the
+list is sorted with a stable LSD radix sort instead of comparisons.
+
+``merge_sort(arr, workers=N)`` sorts large lists on ``N`` processes: the list
+is cut into one chunk per worker, the chunks are sorted in a process pool and
+then merged pairwise in a tree, one pool round per level.  Lists of plain
+ints (fitting in 64 bits) or floats are shared with the workers through
+``multiprocessing.shared_memory`` instead of being pickled.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from multiprocessing import shared_memory
+
+# Lists shorter than this are sorted with a single binary insertion sort.
+MIN_MERGE = 32
+
+# Initial number of consecutive wins before a merge switches to galloping.
+MIN_GALLOP = 7
+
+# Parallel mode only splits lists into chunks of at least this many items;
+# below that, starting the pool costs more than it saves.
+MIN_PARALLEL_CHUNK = 1 << 14
+
+# Typed lists shorter than this are cheaper to sort with comparisons.
+MIN_RADIX = 256
+
+# Bits per radix pass; wider digits lose to the cost of the extra buckets.
+RADIX_DIGIT_BITS = 8
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+_SIGN_BIT = 1 << 63
+_MASK64 = (1 << 64) - 1
+
+
+def _min_run_length(n):
+    # Pick a run length in [MIN_MERGE/2, MIN_MERGE] so n / min_run is close
+    # to, but not above, a power of two; this keeps the final merges balanced.
+    r = 0
+    while n >= MIN_MERGE:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+
+def _count_run_and_make_ascending(a, v, lo, hi):
+    """Return the length of the run starting at ``lo``, reversing it if it descends.
+
+    Here and below ``a`` holds the sort keys and ``v`` is either ``None`` or
+    the list of values that moves in lockstep with them.
+    """
+    run_hi = lo + 1
+    if run_hi == hi:
+        return 1
+    if a[run_hi] < a[lo]:
+        # Only strictly descending runs are reversed, otherwise stability breaks.
+        run_hi += 1
+        while run_hi < hi and a[run_hi] < a[run_hi - 1]:
+            run_hi += 1
+        a[lo:run_hi] = a[lo:run_hi][::-1]
+        if v is not None:
+            v[lo:run_hi] = v[lo:run_hi][::-1]
+    else:
+        run_hi += 1
+        while run_hi < hi and not a[run_hi] < a[run_hi - 1]:
+            run_hi += 1
+    return run_hi - lo
+
+
+def _binary_insertion_sort(a, v, lo, hi, start):
+    """Sort ``a[lo:hi]`` given that ``a[lo:start]`` is already sorted."""
+    for i in range(start, hi):
+        pivot = a[i]
+        pos = bisect_right(a, pivot, lo, i)
+        if pos == i:
+            continue
+        a[pos + 1:i + 1] = a[pos:i]
+        a[pos] = pivot
+        if v is not None:
+            pivot = v[i]
+            v[pos + 1:i + 1] = v[pos:i]
+            v[pos] = pivot
+
+
+def _gallop_left(key, a, base, n, hint):
+    """Return the leftmost offset in ``a[base:base + n]`` where ``key`` can be inserted.
+
+    The search starts at ``base + hint`` and probes outwards at offsets
+    1, 3, 7, ... before finishing with a binary search, so it is cheap when
+    the answer is close to ``hint``.
+    """
+    last_ofs, ofs = 0, 1
+    if a[base + hint] < key:
+        max_ofs = n - hint
+        while ofs < max_ofs and a[base + hint + ofs] < key:
+            last_ofs = ofs
+            ofs = (ofs << 1) + 1
+        if ofs > max_ofs:
+            ofs = max_ofs
+        last_ofs += hint
+        ofs += hint
+    else:
+        max_ofs = hint + 1
+        while ofs < max_ofs and not a[base + hint - ofs] < key:
+            last_ofs = ofs
+            ofs = (ofs << 1) + 1
+        if ofs > max_ofs:
+            ofs = max_ofs
+        last_ofs, ofs = hint - ofs, hint - last_ofs
+    # Now a[base + last_ofs] < key <= a[base + ofs].
+    return bisect_left(a, key, base + last_ofs + 1, base + ofs) - base
+
+
+def _gallop_right(key, a, base, n, hint):
+    """Like ``_gallop_left`` but returns the offset just past any items equal to ``key``."""
+    last_ofs, ofs = 0, 1
+    if key < a[base + hint]:
+        max_ofs = hint + 1
+        while ofs < max_ofs and key < a[base + hint - ofs]:
+            last_ofs = ofs
+            ofs = (ofs << 1) + 1
+        if ofs > max_ofs:
+            ofs = max_ofs
+        last_ofs, ofs = hint - ofs, hint - last_ofs
+    else:
+        max_ofs = n - hint
+        while ofs < max_ofs and not key < a[base + hint + ofs]:
+            last_ofs = ofs
+            ofs = (ofs << 1) + 1
+        if ofs > max_ofs:
+            ofs = max_ofs
+        last_ofs += hint
+        ofs += hint
+    # Now a[base + last_ofs] <= key < a[base + ofs].
+    return bisect_right(a, key, base + last_ofs + 1, base + ofs) - base
+
+
+class _MergeState:
+    """Pending runs and the adaptive galloping threshold for one sort call."""
+
+    def __init__(self, a, v):
+        self.a = a
+        self.v = v
+        self.min_gallop = MIN_GALLOP
+        self.runs = []  # (base, length) pairs, left to right
+
+    def push_run(self, base, length):
+        self.runs.append((base, length))
+
+    def merge_collapse(self):
+        # Keep run lengths decreasing faster than the Fibonacci numbers so the
+        # stack stays O(log n) deep and merges stay balanced.
+        runs = self.runs
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if ((n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1])
+                    or (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1])):
+                if runs[n - 1][1] < runs[n + 1][1]:
+                    n -= 1
+            elif runs[n][1] > runs[n + 1][1]:
+                break
+            self.merge_at(n)
+
+    def merge_force_collapse(self):
+        runs = self.runs
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if n > 0 and runs[n - 1][1] < runs[n + 1][1]:
+                n -= 1
+            self.merge_at(n)
+
+    def merge_at(self, i):
+        a = self.a
+        base_a, len_a = self.runs[i]
+        base_b, len_b = self.runs[i + 1]
+        self.runs[i] = (base_a, len_a + len_b)
+        del self.runs[i + 1]
+
+        # Items at the start of A that are <= B[0] are already in place.
+        k = _gallop_right(a[base_b], a, base_a, len_a, 0)
+        base_a += k
+        len_a -= k
+        if len_a == 0:
+            return
+        # Items at the end of B that are >= A[-1] are already in place.
+        len_b = _gallop_left(a[base_a + len_a - 1], a, base_b, len_b, len_b - 1)
+        if len_b == 0:
+            return
+
+        if len_a <= len_b:
+            self.merge_lo(base_a, len_a, base_b, len_b)
+        else:
+            self.merge_hi(base_a, len_a, base_b, len_b)
+
+    def merge_lo(self, base_a, len_a, base_b, len_b):
+        """Merge adjacent runs left to right, buffering the (shorter) run A."""
+        a, v = self.a, self.v
+        tmp = a[base_a:base_a + len_a]
+        tmp_v = None if v is None else v[base_a:base_a + len_a]
+        ca, cb, dest = 0, base_b, base_a
+
+        # merge_at guarantees B[0] < A[0].
+        a[dest] = a[cb]
+        if v is not None:
+            v[dest] = v[cb]
+        dest += 1
+        cb += 1
+        len_b -= 1
+        if len_b == 0:
+            a[dest:dest + len_a] = tmp
+            if v is not None:
+                v[dest:dest + len_a] = tmp_v
+            return
+        if len_a == 1:
+            a[dest:dest + len_b] = a[cb:cb + len_b]
+            a[dest + len_b] = tmp[ca]
+            if v is not None:
+                v[dest:dest + len_b] = v[cb:cb + len_b]
+                v[dest + len_b] = tmp_v[ca]
+            return
+
+        min_gallop = self.min_gallop
+        done = False
+        try:
+            while not done:
+                count_a = count_b = 0
+                # One item at a time until one run starts winning consistently.
+                while True:
+                    if a[cb] < tmp[ca]:
+                        a[dest] = a[cb]
+                        if v is not None:
+                            v[dest] = v[cb]
+                        dest += 1
+                        cb += 1
+                        count_b += 1
+                        count_a = 0
+                        len_b -= 1
+                        if len_b == 0:
+                            done = True
+                            break
+                    else:
+                        a[dest] = tmp[ca]
+                        if v is not None:
+                            v[dest] = tmp_v[ca]
+                        dest += 1
+                        ca += 1
+                        count_a += 1
+                        count_b = 0
+                        len_a -= 1
+                        if len_a == 1:
+                            done = True
+                            break
+                    if (count_a | count_b) >= min_gallop:
+                        break
+                if done:
+                    break
+
+                # Galloping: copy whole stretches found by exponential search.
+                while True:
+                    count_a = _gallop_right(a[cb], tmp, ca, len_a, 0)
+                    if count_a:
+                        a[dest:dest + count_a] = tmp[ca:ca + count_a]
+                        if v is not None:
+                            v[dest:dest + count_a] = tmp_v[ca:ca + count_a]
+                        dest += count_a
+                        ca += count_a
+                        len_a -= count_a
+                        if len_a <= 1:
+                            done = True
+                            break
+                    a[dest] = a[cb]
+                    if v is not None:
+                        v[dest] = v[cb]
+                    dest += 1
+                    cb += 1
+                    len_b -= 1
+                    if len_b == 0:
+                        done = True
+                        break
+
+                    count_b = _gallop_left(tmp[ca], a, cb, len_b, 0)
+                    if count_b:
+                        a[dest:dest + count_b] = a[cb:cb + count_b]
+                        if v is not None:
+                            v[dest:dest + count_b] = v[cb:cb + count_b]
+                        dest += count_b
+                        cb += count_b
+                        len_b -= count_b
+                        if len_b == 0:
+                            done = True
+                            break
+                    a[dest] = tmp[ca]
+                    if v is not None:
+                        v[dest] = tmp_v[ca]
+                    dest += 1
+                    ca += 1
+                    len_a -= 1
+                    if len_a == 1:
+                        done = True
+                        break
+
+                    min_gallop -= 1
+                    if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                        break
+                if done:
+                    break
+                # Galloping stopped paying off; make it harder to re-enter.
+                if min_gallop < 0:
+                    min_gallop = 0
+                min_gallop += 2
+        finally:
+            if not done:
+                # A comparison raised: put the rest of A back into the gap in
+                # front of what is left of B, so like list.sort the list still
+                # holds every item exactly once.
+                a[dest:dest + len_a] = tmp[ca:ca + len_a]
+                if v is not None:
+                    v[dest:dest + len_a] = tmp_v[ca:ca + len_a]
+
+        self.min_gallop = max(1, min_gallop)
+        if len_a == 1:
+            a[dest:dest + len_b] = a[cb:cb + len_b]
+            a[dest + len_b] = tmp[ca]
+            if v is not None:
+                v[dest:dest + len_b] = v[cb:cb + len_b]
+                v[dest + len_b] = tmp_v[ca]
+        elif len_a:
+            # B is exhausted; the rest of A goes at the end.  (len_a == 0 can
+            # only happen with an inconsistent ordering such as NaN, and then
+            # the remainder of B is already in place.)
+            a[dest:dest + len_a] = tmp[ca:ca + len_a]
+            if v is not None:
+                v[dest:dest + len_a] = tmp_v[ca:ca + len_a]
+
+    def merge_hi(self, base_a, len_a, base_b, len_b):
+        """Merge adjacent runs right to left, buffering the (shorter) run B."""
+        a, v = self.a, self.v
+        tmp = a[base_b:base_b + len_b]
+        tmp_v = None if v is None else v[base_b:base_b + len_b]
+        ca, cb, dest = base_a + len_a - 1, len_b - 1, base_b + len_b - 1
+
+        # merge_at guarantees A[-1] > B[-1].
+        a[dest] = a[ca]
+        if v is not None:
+            v[dest] = v[ca]
+        dest -= 1
+        ca -= 1
+        len_a -= 1
+        if len_a == 0:
+            a[dest - len_b + 1:dest + 1] = tmp
+            if v is not None:
+                v[dest - len_b + 1:dest + 1] = tmp_v
+            return
+        if len_b == 1:
+            dest -= len_a
+            ca -= len_a
+            a[dest + 1:dest + 1 + len_a] = a[ca + 1:ca + 1 + len_a]
+            a[dest] = tmp[cb]
+            if v is not None:
+                v[dest + 1:dest + 1 + len_a] = v[ca + 1:ca + 1 + len_a]
+                v[dest] = tmp_v[cb]
+            return
+
+        min_gallop = self.min_gallop
+        done = False
+        try:
+            while not done:
+                count_a = count_b = 0
+                while True:
+                    if tmp[cb] < a[ca]:
+                        a[dest] = a[ca]
+                        if v is not None:
+                            v[dest] = v[ca]
+                        dest -= 1
+                        ca -= 1
+                        count_a += 1
+                        count_b = 0
+                        len_a -= 1
+                        if len_a == 0:
+                            done = True
+                            break
+                    else:
+                        a[dest] = tmp[cb]
+                        if v is not None:
+                            v[dest] = tmp_v[cb]
+                        dest -= 1
+                        cb -= 1
+                        count_b += 1
+                        count_a = 0
+                        len_b -= 1
+                        if len_b == 1:
+                            done = True
+                            break
+                    if (count_a | count_b) >= min_gallop:
+                        break
+                if done:
+                    break
+
+                while True:
+                    count_a = len_a - _gallop_right(tmp[cb], a, base_a, len_a, len_a - 1)
+                    if count_a:
+                        dest -= count_a
+                        ca -= count_a
+                        len_a -= count_a
+                        a[dest + 1:dest + 1 + count_a] = a[ca + 1:ca + 1 + count_a]
+                        if v is not None:
+                            v[dest + 1:dest + 1 + count_a] = v[ca + 1:ca + 1 + count_a]
+                        if len_a == 0:
+                            done = True
+                            break
+                    a[dest] = tmp[cb]
+                    if v is not None:
+                        v[dest] = tmp_v[cb]
+                    dest -= 1
+                    cb -= 1
+                    len_b -= 1
+                    if len_b == 1:
+                        done = True
+                        break
+
+                    count_b = len_b - _gallop_left(a[ca], tmp, 0, len_b, len_b - 1)
+                    if count_b:
+                        dest -= count_b
+                        cb -= count_b
+                        len_b -= count_b
+                        a[dest + 1:dest + 1 + count_b] = tmp[cb + 1:cb + 1 + count_b]
+                        if v is not None:
+                            v[dest + 1:dest + 1 + count_b] = tmp_v[cb + 1:cb + 1 + count_b]
+                        if len_b <= 1:
+                            done = True
+                            break
+                    a[dest] = a[ca]
+                    if v is not None:
+                        v[dest] = v[ca]
+                    dest -= 1
+                    ca -= 1
+                    len_a -= 1
+                    if len_a == 0:
+                        done = True
+                        break
+
+                    min_gallop -= 1
+                    if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                        break
+                if done:
+                    break
+                if min_gallop < 0:
+                    min_gallop = 0
+                min_gallop += 2
+        finally:
+            if not done:
+                # A comparison raised: put the rest of B back into the gap
+                # after what is left of A (see merge_lo).
+                a[dest - len_b + 1:dest + 1] = tmp[:len_b]
+                if v is not None:
+                    v[dest - len_b + 1:dest + 1] = tmp_v[:len_b]
+
+        self.min_gallop = max(1, min_gallop)
+        if len_b == 1:
+            dest -= len_a
+            ca -= len_a
+            a[dest + 1:dest + 1 + len_a] = a[ca + 1:ca + 1 + len_a]
+            a[dest] = tmp[cb]
+            if v is not None:
+                v[dest + 1:dest + 1 + len_a] = v[ca + 1:ca + 1 + len_a]
+                v[dest] = tmp_v[cb]
+        elif len_b:
+            # A is exhausted; the rest of B goes at the front.
+            a[dest - len_b + 1:dest + 1] = tmp[:len_b]
+            if v is not None:
+                v[dest - len_b + 1:dest + 1] = tmp_v[:len_b]
+
+
+def _merge_sort_runs(a, v=None):
+    """Sort ``a`` (and ``v`` alongside it) in place by detecting and merging runs."""
+    n = len(a)
+    if n < 2:
+        return
+
+    if n < MIN_MERGE:
+        run_len = _count_run_and_make_ascending(a, v, 0, n)
+        _binary_insertion_sort(a, v, 0, n, run_len)
+        return
+
+    state = _MergeState(a, v)
+    min_run = _min_run_length(n)
+    lo = 0
+    remaining = n
+    while remaining:
+        run_len = _count_run_and_make_ascending(a, v, lo, lo + remaining)
+        if run_len < min_run:
+            forced = min(remaining, min_run)
+            _binary_insertion_sort(a, v, lo, lo + forced, lo + run_len)
+            run_len = forced
+        state.push_run(lo, run_len)
+        state.merge_collapse()
+        lo += run_len
+        remaining -= run_len
+    state.merge_force_collapse()
+
+
+def merge_sort(arr, key=None, reverse=False, workers=None):
+    """Sort the list ``arr`` in place (stable, adaptive to existing runs).
+
+    ``key`` and ``reverse`` work as for ``list.sort``.  ``workers`` greater
+    than one sorts on that many processes when the list is large enough to
+    be worth it; ``None`` or ``1`` sorts in this process.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    n = len(arr)
+    if n < 2:
+        return
+
+    keys = None if key is None else [key(x) for x in arr]
+    if reverse:
+        # Reversing before and after a stable ascending sort gives a stable
+        # descending sort.
+        arr.reverse()
+        if keys is not None:
+            keys.reverse()
+
+    chunks = 0 if workers is None else min(workers, n // MIN_PARALLEL_CHUNK)
+    if chunks > 1:
+        _parallel_merge_sort(arr, keys, workers, chunks)
+    else:
+        if not _radix_sort(arr, keys):
+            a, v = (arr, None) if keys is None else (keys, arr)
+            _merge_sort_runs(a, v)
+
+    if reverse:
+        arr.reverse()
+
+
+def _radix_pays_off(n, bits):
+    # Measured on CPython: a radix pass costs about as much as four levels of
+    # merging, so radix sort wins while passes <= log2(n) - 4.
+    passes = -(-bits // RADIX_DIGIT_BITS)
+    return passes <= n.bit_length() - 4
+
+
+def _has_few_runs(items):
+    """Return whether ``items`` splits into fewer than ``len(items) // MIN_MERGE`` natural runs.
+
+    Radix sort cannot take advantage of presorted input, and for input this
+    close to sorted merging the runs is much faster.  Random input reaches
+    the limit after a short prefix, so the scan is cheap either way.
+    """
+    n = len(items)
+    limit = n // MIN_MERGE
+    runs = 0
+    lo = 0
+    while lo < n:
+        runs += 1
+        if runs >= limit:
+            return False
+        hi = lo + 1
+        if hi < n and items[hi] < items[lo]:
+            hi += 1
+            while hi < n and items[hi] < items[hi - 1]:
+                hi += 1
+        else:
+            while hi < n and not items[hi] < items[hi - 1]:
+                hi += 1
+        lo = hi
+    return True
+
+
+def _radix_sort_ints(values, bits):
+    """Stable LSD radix sort of non-negative ints below ``1 << bits``; returns a new list."""
+    mask = (1 << RADIX_DIGIT_BITS) - 1
+    for shift in range(0, bits, RADIX_DIGIT_BITS):
+        buckets = [[] for _ in range(mask + 1)]
+        appends = [bucket.append for bucket in buckets]
+        for x in values:
+            appends[(x >> shift) & mask](x)
+        values = list(chain.from_iterable(buckets))
+    return values
+
+
+def _float_ranks(floats):
+    """Map floats to unsigned ints in the same order; 0.0 and -0.0 map alike."""
+    bits = memoryview(array("d", floats)).cast("B").cast("Q").tolist()
+    return [u | _SIGN_BIT if u <= _SIGN_BIT else _MASK64 ^ u for u in bits]
+
+
+def _floats_from_ranks(ranks):
+    bits = array("Q", [r ^ _SIGN_BIT if r >= _SIGN_BIT else _MASK64 ^ r for r in ranks])
+    return memoryview(bits).cast("B").cast("d").tolist()
+
+
+def _radix_sort(arr, keys):
+    """Radix sort ``arr`` in place if all sort keys are ints or floats; return whether it did.
+
+    Keys are turned into non-negative integer ranks.  Without a key the
+    sorted ranks are turned straight back into items; with a key each rank
+    is tagged with its item's index, which both keeps the sort stable and
+    says where the item goes.
+    """
+    items = arr if keys is None else keys
+    n = len(items)
+    if n < MIN_RADIX:
+        return False
+
+    first = type(items[0])
+    if first is int:
+        if not all(type(x) is int for x in items) or _has_few_runs(items):
+            return False
+        low = min(items)
+        bits = (max(items) - low).bit_length()
+        if keys is None:
+            if not _radix_pays_off(n, bits):
+                return False
+            arr[:] = [r + low for r in _radix_sort_ints([x - low for x in items], bits)]
+            return True
+        ranks = [x - low for x in items]
+    elif first is float:
+        if not all(type(x) is float for x in items) or any(x != x for x in items):
+            # NaN compares false with everything, so it has no rank.
+            return False
+        if _has_few_runs(items):
+            return False
+        ranks = _float_ranks(items)
+        low = min(ranks)
+        bits = (max(ranks) - low).bit_length()
+        if keys is None:
+            if not _radix_pays_off(n, bits):
+                return False
+            # Signed zeros share a rank; put them back in their input order.
+            zeros = [x for x in items if x == 0.0]
+            ranks = _radix_sort_ints([r - low for r in ranks], bits)
+            arr[:] = _floats_from_ranks([r + low for r in ranks])
+            if zeros:
+                start = bisect_left(arr, 0.0)
+                arr[start:start + len(zeros)] = zeros
+            return True
+        ranks = [r - low for r in ranks]
+    else:
+        return False
+
+    index_bits = (n - 1).bit_length()
+    if not _radix_pays_off(n, bits + index_bits):
+        return False
+    index_mask = (1 << index_bits) - 1
+    tagged = _radix_sort_ints([(r << index_bits) | i for i, r in enumerate(ranks)],
+                              bits + index_bits)
+    arr[:] = [arr[t & index_mask] for t in tagged]
+    keys[:] = [keys[t & index_mask] for t in tagged]
+    return True
+
+
+def _shared_typecode(arr):
+    """Return an ``array`` typecode that holds every item of ``arr`` exactly, or None."""
+    first = type(arr[0])
+    if first is float:
+        if all(type(x) is float for x in arr):
+            return "d"
+    elif first is int:
+        if all(type(x) is int for x in arr) and _INT64_MIN <= min(arr) and max(arr) <= _INT64_MAX:
+            return "q"
+    return None
+
+
+def _sort_pairs(keys, values):
+    if keys is None:
+        merge_sort(values)
+    elif not _radix_sort(values, keys):
+        _merge_sort_runs(keys, values)
+    return keys, values
+
+
+def _merge_pairs(left, right):
+    # Two sorted runs back to back: the run merge finds both and gallops.
+    left_keys, left_values = left
+    right_keys, right_values = right
+    values = left_values + right_values
+    if left_keys is None:
+        _merge_sort_runs(values)
+        return None, values
+    keys = left_keys + right_keys
+    _merge_sort_runs(keys, values)
+    return keys, values
+
+
+def _sort_shared_range(name, typecode, lo, hi):
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf.cast(typecode)
+    try:
+        chunk = view[lo:hi].tolist()
+        merge_sort(chunk)
+        view[lo:hi] = array(typecode, chunk)
+    finally:
+        view.release()
+        shm.close()
+
+
+def _merge_shared_ranges(src_name, dst_name, typecode, lo, mid, hi):
+    """Merge the sorted ranges ``[lo, mid)`` and ``[mid, hi)`` of one buffer into another."""
+    src = shared_memory.SharedMemory(name=src_name)
+    dst = shared_memory.SharedMemory(name=dst_name)
+    src_view = src.buf.cast(typecode)
+    dst_view = dst.buf.cast(typecode)
+    try:
+        run = src_view[lo:hi].tolist()
+        if mid < hi:
+            _merge_sort_runs(run)
+        dst_view[lo:hi] = array(typecode, run)
+    finally:
+        src_view.release()
+        dst_view.release()
+        src.close()
+        dst.close()
+
+
+def _parallel_merge_sort(arr, keys, workers, chunks):
+    n = len(arr)
+    bounds = [n * i // chunks for i in range(chunks + 1)]
+    typecode = None if keys is not None else _shared_typecode(arr)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if typecode is None:
+            _parallel_sort_objects(arr, keys, bounds, executor)
+        else:
+            _parallel_sort_shared(arr, typecode, bounds, executor)
+
+
+def _parallel_sort_objects(arr, keys, bounds, executor):
+    ranges = list(zip(bounds, bounds[1:]))
+    chunk_keys = [None if keys is None else keys[lo:hi] for lo, hi in ranges]
+    runs = list(executor.map(_sort_pairs, chunk_keys, [arr[lo:hi] for lo, hi in ranges]))
+    while len(runs) > 2:
+        lefts, rights = runs[0::2], runs[1::2]
+        merged = list(executor.map(_merge_pairs, lefts, rights))
+        if len(lefts) > len(rights):
+            merged.append(lefts[-1])
+        runs = merged
+    # The last merge happens here so the two biggest runs are not pickled again.
+    arr[:] = (_merge_pairs(*runs) if len(runs) == 2 else runs[0])[1]
+
+
+def _parallel_sort_shared(arr, typecode, bounds, executor):
+    nbytes = max(1, len(arr) * array(typecode).itemsize)
+    src = dst = None
+    try:
+        src = shared_memory.SharedMemory(create=True, size=nbytes)
+        dst = shared_memory.SharedMemory(create=True, size=nbytes)
+        view = src.buf.cast(typecode)
+        view[:len(arr)] = array(typecode, arr)
+        view.release()
+
+        tasks = [executor.submit(_sort_shared_range, src.name, typecode, lo, hi)
+                 for lo, hi in zip(bounds, bounds[1:])]
+        for task in tasks:
+            task.result()
+
+        # Merge neighbouring ranges pairwise, ping-ponging between buffers;
+        # an unpaired last range is copied across unchanged.
+        while len(bounds) > 2:
+            last = len(bounds) - 1
+            tasks = []
+            for i in range(0, last, 2):
+                lo, mid, hi = bounds[i], bounds[i + 1], bounds[min(i + 2, last)]
+                tasks.append(executor.submit(_merge_shared_ranges, src.name, dst.name,
+                                             typecode, lo, mid, hi))
+            for task in tasks:
+                task.result()
+            bounds = bounds[0:last:2] + [bounds[last]]
+            src, dst = dst, src
+
+        view = src.buf.cast(typecode)
+        arr[:] = view[:len(arr)].tolist()
+        view.release()
+    finally:
+        for shm in (src, dst):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
@@ -0,0 +1,61 @@
+"""Scaling benchmark for ``merge_sort(arr, workers=N)``.
+
+Times the sequential adaptive merge sort, the parallel mode at increasing
+worker counts and the built-in ``sorted`` on the same random floats, and
+prints one row per variant with the best time and the speedup over the
+sequential sort.
+
+    python bench_parallel_merge_sort.py --size 2000000 --workers 1 2 4 8 16 32
+"""
+import argparse
+import os
+import random
+import time
+
+from adaptive_merge_sort import merge_sort
+
+
+def best_time(sort, data, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        arr = list(data)
+        start = time.perf_counter()
+        sort(arr)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark parallel merge sort scaling.")
+    parser.add_argument("--size", type=int, default=1_000_000, help="number of items to sort")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[n for n in (2, 4, 8, 16, 32) if n <= (os.cpu_count() or 1)],
+                        help="worker counts to try")
+    parser.add_argument("--dtype", choices=["float", "int", "str"], default="float",
+                        help="item type; float and int use shared memory, str is pickled")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant; the best is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    if args.dtype == "float":
+        data = [rng.random() for _ in range(args.size)]
+    elif args.dtype == "int":
+        data = [rng.randrange(-2**62, 2**62) for _ in range(args.size)]
+    else:
+        data = [str(rng.random()) for _ in range(args.size)]
+
+    sequential = best_time(merge_sort, data, args.repeat)
+    rows = [("merge_sort", sequential)]
+    for workers in args.workers:
+        rows.append((f"merge_sort(workers={workers})",
+                     best_time(lambda arr: merge_sort(arr, workers=workers), data, args.repeat)))
+    rows.append(("sorted", best_time(sorted, data, args.repeat)))
+
+    print(f"{args.size} {args.dtype} items, best of {args.repeat}")
+    for name, seconds in rows:
+        print(f"{name:<28} {seconds:10.3f} s {sequential / seconds:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Steady-state insert + query benchmark: ``SortedList`` vs re-sort-then-search.
+
+Each tick appends a batch of new values and then runs a batch of lookups;
+the two phases are timed separately for the inserts/s and queries/s columns.
+The re-sort approach extends a plain list, sorts the whole list again with
+``merge_sort`` and looks values up with a binary search; the container
+approach calls ``SortedList.update`` and ``SortedList.binary_search``.  Each
+value type (``--values``) is timed separately, since ints and floats can take
+merge_sort's radix path and strings cannot.
+
+    python bench_sorted_list.py --size 1000000 --batch 2000 --queries 2000 --ticks 20
+    python bench_sorted_list.py --values int str
+"""
+import argparse
+import random
+import time
+from bisect import bisect_left
+
+from adaptive_merge_sort import merge_sort
+from sorted_list import SortedList
+
+# Numeric values can take merge_sort's radix path; strings always compare.
+VALUES = {
+    "int": int,
+    "float": float,
+    "str": lambda x: f"{x:012d}",
+}
+
+
+def binary_search(arr, target):
+    # Same contract as the q3 kernel and SortedList.binary_search.
+    i = bisect_left(arr, target)
+    return i if i < len(arr) and arr[i] == target else -1
+
+
+# Each run returns the seconds spent inserting and the seconds spent looking up.
+
+def run_resort(initial, batches, queries):
+    values = list(initial)
+    merge_sort(values)
+    insert_seconds = query_seconds = 0.0
+    for batch, targets in zip(batches, queries):
+        start = time.perf_counter()
+        values.extend(batch)
+        merge_sort(values)
+        middle = time.perf_counter()
+        for target in targets:
+            binary_search(values, target)
+        insert_seconds += middle - start
+        query_seconds += time.perf_counter() - middle
+    return insert_seconds, query_seconds
+
+
+def run_sorted_list(initial, batches, queries):
+    container = SortedList(initial)
+    insert_seconds = query_seconds = 0.0
+    for batch, targets in zip(batches, queries):
+        start = time.perf_counter()
+        container.update(batch)
+        middle = time.perf_counter()
+        for target in targets:
+            container.binary_search(target)
+        insert_seconds += middle - start
+        query_seconds += time.perf_counter() - middle
+    return insert_seconds, query_seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark SortedList against re-sorting.")
+    parser.add_argument("--size", type=int, default=200_000, help="values present before the first tick")
+    parser.add_argument("--batch", type=int, default=2000, help="new values per tick")
+    parser.add_argument("--queries", type=int, default=2000, help="lookups per tick")
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--values", nargs="+", choices=list(VALUES), default=list(VALUES),
+                        help="value types to benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{args.size} initial values, {args.ticks} ticks of {args.batch} inserts "
+          f"+ {args.queries} queries")
+    for kind in args.values:
+        rng = random.Random(args.seed)
+        convert = VALUES[kind]
+
+        def value():
+            return convert(rng.randrange(10**12))
+        initial = [value() for _ in range(args.size)]
+        batches = [[value() for _ in range(args.batch)] for _ in range(args.ticks)]
+        queries = [[value() if rng.random() < 0.5 else rng.choice(initial) for _ in range(args.queries)]
+                   for _ in range(args.ticks)]
+
+        for name, run in (("re-sort + binary_search", run_resort), ("SortedList", run_sorted_list)):
+            insert_seconds, query_seconds = run(initial, batches, queries)
+            seconds = insert_seconds + query_seconds
+            inserts = args.ticks * args.batch / insert_seconds
+            lookups = args.ticks * args.queries / query_seconds
+            print(f"{kind:<6} {name:<24} {seconds:8.3f} s {args.ticks / seconds:10.1f} ticks/s "
+                  f"{inserts:12.0f} inserts/s {lookups:12.0f} queries/s")
+
+
+if __name__ == "__main__":
+    main()
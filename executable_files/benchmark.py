@@ -0,0 +1,359 @@
+"""Benchmark and profiling harness for the five kernels.
+
+Every kernel is timed at several input sizes.  Inputs are built from the
+hypothesis strategies the kernel's tests already use: a fixed-seed sample of
+examples is drawn once and scaled up to the requested size.  For each kernel
+and size the JSON report gives ops/sec, per-call latency percentiles and the
+peak memory of a single call.
+
+Single calls of the fast kernels take about a microsecond, which is too
+close to the timer's own overhead to measure one at a time.  Instead, like
+``timeit``, each sample times a batch of back-to-back calls, with the batch
+size chosen so that a batch runs for at least ``--sample-time`` seconds.
+The whole sweep over kernels and sizes runs ``--repeat`` times and each
+entry reports the round with the lowest median, since it is the one least
+disturbed by the rest of the machine.
+
+    python benchmark.py --sizes 100 1000 10000 --output bench.json
+    python benchmark.py --baseline bench.json --threshold 0.2
+    python benchmark.py --kernels merge_sort --profile-dir profiles
+
+With ``--baseline`` the run exits with status 1 when a kernel's median
+latency grew by more than ``--threshold`` (a fraction) over the baseline,
+when a larger share of its calls raise, or when a kernel that used to
+finish now fails.  ``--profile-dir`` also writes a cProfile ``.prof`` file and a
+tracemalloc snapshot for each kernel and size.  A measurement that runs
+longer than ``--timeout`` seconds (the kernels are not guaranteed to
+terminate) is reported as an error instead of hanging.
+"""
+import argparse
+import cProfile
+import gc
+import json
+import math
+import os
+import platform
+import random
+import signal
+import sys
+import time
+import tracemalloc
+
+from hypothesis import HealthCheck, Phase, given, seed, settings, strategies as st
+
+import kernels
+from test_binary_search import sorted_list_strategy, target_strategy
+from test_parse_date import valid_date_strategy
+from test_transpose import fixed_3x3_matrix_strategy
+
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_SAMPLES = 30
+DEFAULT_REPEAT = 3
+DEFAULT_SAMPLE_TIME = 0.005
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_THRESHOLD = 0.2
+
+# Examples drawn from each strategy; inputs are built by resampling these.
+SAMPLE_EXAMPLES = 100
+
+
+class KernelTimeout(BaseException):
+    # Not an Exception, so a kernel's own ``except Exception`` cannot swallow it.
+    pass
+
+
+def draw_examples(strategy, count=SAMPLE_EXAMPLES, seed_value=0):
+    """Return up to ``count`` examples of ``strategy``, the same ones on every run."""
+    examples = []
+
+    @seed(seed_value)
+    @settings(max_examples=count, database=None, deadline=None, phases=[Phase.generate],
+              suppress_health_check=list(HealthCheck))
+    @given(strategy)
+    def collect(example):
+        examples.append(example)
+
+    collect()
+    return examples[:count]
+
+
+_pools = {}
+
+
+def _pool(name, strategy, flatten):
+    """Return the flattened sample for ``strategy``, drawing it on first use."""
+    if name not in _pools:
+        _pools[name] = [item for example in draw_examples(strategy) for item in flatten(example)]
+    return _pools[name]
+
+
+# Each workload takes (size, rng) and returns (function, prepare), where
+# prepare() builds the arguments for one call outside the timed region.
+
+def _transpose_workload(size, rng):
+    cells = _pool("matrix cells", fixed_3x3_matrix_strategy(),
+                  lambda matrix: [x for row in matrix for x in row])
+    side = max(1, math.isqrt(size))
+    matrix = [[rng.choice(cells) for _ in range(side)] for _ in range(side)]
+    return kernels.transpose, lambda: (matrix,)
+
+
+def _parse_date_workload(size, rng):
+    # A date string does not grow; calls cycle through ``size`` distinct ones.
+    dates = _pool("dates", valid_date_strategy(), lambda date: [date])
+    inputs = [rng.choice(dates) for _ in range(size)]
+    return kernels.parse_date, lambda: (rng.choice(inputs),)
+
+
+def _binary_search_workload(size, rng):
+    values = _pool("sorted list items", sorted_list_strategy(), lambda items: items)
+    targets = _pool("targets", target_strategy(), lambda target: [target])
+    array = sorted(rng.choice(values) for _ in range(size))
+    return kernels.binary_search, lambda: (array, rng.choice(targets))
+
+
+def _lru_cache_workload(size, rng):
+    # A full cache of ``size`` entries hit by a working set twice as large,
+    # so about half the calls are hits and half are evictions.
+    ints = _pool("ints", st.integers(), lambda x: [x])
+    working_set = [(rng.choice(ints), rng.choice(ints)) for _ in range(2 * size)]
+    cached = kernels.lru_cache(lambda x, y: x + y, cacheLimit=size)
+    for x, y in working_set[:size]:
+        cached(x, y)
+    return cached, lambda: rng.choice(working_set)
+
+
+def _merge_sort_workload(size, rng):
+    ints = _pool("int lists", st.lists(st.integers()), lambda items: items)
+    data = [rng.choice(ints) for _ in range(size)]
+    return kernels.merge_sort, lambda: (list(data),)
+
+
+WORKLOADS = {
+    "transpose": _transpose_workload,
+    "parse_date": _parse_date_workload,
+    "binary_search": _binary_search_workload,
+    "lru_cache": _lru_cache_workload,
+    "merge_sort": _merge_sort_workload,
+}
+
+
+def _raise_timeout(signum, frame):
+    raise KernelTimeout()
+
+
+def _time_calls(function, prepare, samples, number):
+    """Time ``samples`` batches of ``number`` back-to-back calls.
+
+    Returns the mean per-call latency of each batch in nanoseconds and the
+    number of calls that raised.
+    """
+    latencies = []
+    errors = 0
+    for _ in range(samples):
+        batch = [prepare() for _ in range(number)]
+        # As in timeit, keep garbage collection pauses out of the timings.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter_ns()
+            for args in batch:
+                try:
+                    function(*args)
+                except Exception:
+                    errors += 1
+            latencies.append((time.perf_counter_ns() - start) / number)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    return latencies, errors
+
+
+def _autorange(function, prepare, sample_time):
+    """Return a batch size whose calls take at least ``sample_time`` seconds."""
+    number = 1
+    while True:
+        latencies, _ = _time_calls(function, prepare, 1, number)
+        if latencies[0] * number >= sample_time * 1e9:
+            return number
+        number *= 2
+
+
+def _peak_memory(function, prepare, snapshot_path=None):
+    """Return the peak bytes allocated during one call."""
+    args = prepare()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        try:
+            result = function(*args)
+        except Exception:
+            result = None
+        peak = tracemalloc.get_traced_memory()[1] - before
+        if snapshot_path is not None:
+            tracemalloc.take_snapshot().dump(snapshot_path)
+        del result
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _percentile(ordered, fraction):
+    # Nearest-rank percentile of an already sorted list.
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def measure(kernel, size, samples=DEFAULT_SAMPLES, timeout=DEFAULT_TIMEOUT, profile_dir=None,
+            seed_value=0, sample_time=DEFAULT_SAMPLE_TIME):
+    """Benchmark one kernel at one size and return its report entry."""
+    rng = random.Random(seed_value)
+    function, prepare = WORKLOADS[kernel](size, rng)
+
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        number = _autorange(function, prepare, sample_time)  # also warms up
+        latencies, errors = _time_calls(function, prepare, samples, number)
+        snapshot_path = None
+        if profile_dir is not None:
+            os.makedirs(profile_dir, exist_ok=True)
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                _time_calls(function, prepare, samples, number)
+            finally:
+                profiler.disable()
+            profiler.dump_stats(os.path.join(profile_dir, f"{kernel}-{size}.prof"))
+            snapshot_path = os.path.join(profile_dir, f"{kernel}-{size}.tracemalloc")
+        peak = _peak_memory(function, prepare, snapshot_path)
+    except KernelTimeout:
+        return {"error": f"timed out after {timeout:g}s"}
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+    ordered = sorted(latencies)
+    total_seconds = sum(latencies) / 1e9
+    return {
+        "calls": samples * number,
+        "errors": errors,
+        "samples": samples,
+        "batch": number,
+        "repeat": 1,
+        "ops_per_sec": samples / total_seconds if total_seconds else float("inf"),
+        "latency_us": {
+            "min": ordered[0] / 1e3,
+            "p50": _percentile(ordered, 0.50) / 1e3,
+            "p90": _percentile(ordered, 0.90) / 1e3,
+            "p99": _percentile(ordered, 0.99) / 1e3,
+            "max": ordered[-1] / 1e3,
+        },
+        "peak_memory_bytes": peak,
+    }
+
+
+def run_benchmarks(kernel_names=None, sizes=DEFAULT_SIZES, samples=DEFAULT_SAMPLES,
+                   timeout=DEFAULT_TIMEOUT, profile_dir=None, repeat=DEFAULT_REPEAT,
+                   sample_time=DEFAULT_SAMPLE_TIME):
+    """Benchmark each kernel at each size and return the full report.
+
+    The whole sweep is repeated ``repeat`` times, rather than each measurement
+    back to back, so that a slow spell on the machine only spoils some of the
+    rounds.  Each entry is the round with the lowest median latency, with
+    calls and errors summed over all rounds.
+    """
+    kernel_names = kernel_names or list(WORKLOADS)
+    results = {kernel: {} for kernel in kernel_names}
+    for round_index in range(repeat):
+        for kernel in kernel_names:
+            for size in sizes:
+                best = results[kernel].get(str(size))
+                if best is not None and "error" in best:
+                    # A kernel that timed out would only time out again.
+                    continue
+                entry = measure(kernel, size, samples, timeout,
+                                profile_dir if round_index == 0 else None, sample_time=sample_time)
+                results[kernel][str(size)] = entry if best is None else _best_round(best, entry)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def _best_round(best, entry):
+    """Combine two rounds of one kernel and size, keeping the lower median latency."""
+    if "error" in entry:
+        return entry
+    totals = {field: best[field] + entry[field] for field in ("calls", "errors", "repeat")}
+    if entry["latency_us"]["p50"] < best["latency_us"]["p50"]:
+        best = entry
+    return {**best, **totals}
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return one message per kernel and size that regressed against ``baseline``."""
+    regressions = []
+    for kernel, sizes in baseline["results"].items():
+        for size, old in sizes.items():
+            new = report["results"].get(kernel, {}).get(size)
+            if new is None or "error" in old:
+                continue
+            if "error" in new:
+                regressions.append(f"{kernel} at size {size}: {new['error']}")
+                continue
+            # Runs may time different numbers of calls, so compare error rates.
+            if new["errors"] * old["calls"] > old["errors"] * new["calls"]:
+                regressions.append(f"{kernel} at size {size}: errors "
+                                   f"{old['errors']}/{old['calls']} -> {new['errors']}/{new['calls']} calls")
+            old_p50 = old["latency_us"]["p50"]
+            new_p50 = new["latency_us"]["p50"]
+            if new_p50 > old_p50 * (1 + threshold):
+                regressions.append(f"{kernel} at size {size}: median latency {old_p50:.1f}us -> "
+                                   f"{new_p50:.1f}us (+{new_p50 / old_p50 - 1:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the five kernels.")
+    parser.add_argument("--kernels", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="input sizes (list length, matrix cells, cache entries)")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES,
+                        help="timed batches of calls per repeat, for each kernel and size")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="rounds of samples; the round with the lowest median is reported")
+    parser.add_argument("--sample-time", type=float, default=DEFAULT_SAMPLE_TIME,
+                        help="minimum seconds per batch; sets how many calls a batch makes")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="seconds allowed per kernel and size before it counts as hung")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown of the median latency, as a fraction")
+    parser.add_argument("--profile-dir", help="write cProfile and tracemalloc dumps here")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.kernels, args.sizes, args.samples, args.timeout, args.profile_dir,
+                            args.repeat, args.sample_time)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""External merge sort for line-oriented files that do not fit in memory.
+
+The input is read in chunks whose estimated size stays under ``memory_limit``
+bytes.  Each chunk is sorted with ``adaptive_merge_sort.merge_sort`` and
+spilled to a temporary run file, then the runs are k-way merged with a heap
+(``heapq.merge``).  When there are more than ``fan_in`` runs they are merged in
+several passes so the number of open files stays bounded.  Records are lines
+ending in ``\n`` (a lone ``\r`` is part of the record, not a line break); a
+missing newline on the last line is added so every record in the output is
+newline-terminated.  The sort is stable.
+
+Example::
+
+    python external_sort.py records.txt sorted.txt --memory-limit 268435456
+"""
+import argparse
+import heapq
+import os
+import sys
+import tempfile
+
+from adaptive_merge_sort import merge_sort
+
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+DEFAULT_FAN_IN = 64
+
+# Per-record bookkeeping cost of a list slot.
+_SLOT_SIZE = 8
+
+
+def _sorted_chunks(records, key, memory_limit):
+    """Yield ``(chunk, last)`` pairs of sorted records, each chunk using roughly
+    ``memory_limit`` bytes; ``last`` is true for the final chunk.
+    """
+    chunk = []
+    keys = []
+    used = 0
+    records = iter(records)
+    record = next(records, None)
+    while record is not None:
+        following = next(records, None)
+        if not record.endswith("\n"):
+            if following is not None:
+                raise ValueError(f"record {record!r} is not newline-terminated")
+            # Only the last line of a file can lack its newline.
+            record += "\n"
+        chunk.append(record)
+        used += sys.getsizeof(record) + _SLOT_SIZE
+        if key is not None:
+            # The key and its index, plus slots in ``keys``, the index list,
+            # merge_sort's key list and the reordered chunk.
+            keys.append(key(record))
+            used += sys.getsizeof(keys[-1]) + sys.getsizeof(len(keys)) + 4 * _SLOT_SIZE
+        if used >= memory_limit or following is None:
+            if key is None:
+                merge_sort(chunk)
+            else:
+                # Sort indices by the keys already computed (and measured)
+                # rather than calling key a second time.
+                order = list(range(len(chunk)))
+                merge_sort(order, key=keys.__getitem__)
+                chunk = [chunk[i] for i in order]
+                del order
+            yield chunk, following is None
+            chunk = []
+            keys = []
+            used = 0
+        record = following
+
+
+def _write_run(lines, tmp_dir):
+    fd, path = tempfile.mkstemp(prefix="run-", suffix=".txt", dir=tmp_dir)
+    # surrogatepass lets any str round-trip through the run file, including
+    # lone surrogates that strict UTF-8 cannot encode.
+    with open(fd, "w", encoding="utf-8", errors="surrogatepass", newline="\n") as f:
+        f.writelines(lines)
+    return path
+
+
+def _merge_runs(paths, key):
+    """Yield the merged contents of the sorted run files at ``paths``."""
+    files = [open(path, encoding="utf-8", errors="surrogatepass", newline="\n")
+             for path in paths]
+    try:
+        # heapq.merge breaks ties by input order, so earlier runs win and the
+        # overall sort stays stable.
+        yield from heapq.merge(*files, key=key)
+    finally:
+        for f in files:
+            f.close()
+
+
+def external_sorted(records, key=None, memory_limit=DEFAULT_MEMORY_LIMIT,
+                    fan_in=DEFAULT_FAN_IN, tmp_dir=None):
+    """Yield the lines of ``records`` in sorted order using bounded memory.
+
+    ``records`` is any iterable of strings (for example a text file opened
+    with ``newline="\\n"``); every record but the last must end with ``\\n``.
+    ``key`` is applied to each record when its chunk is sorted and again
+    when runs are merged.  Sorted runs are spilled to a private
+    temporary directory under ``tmp_dir`` that is removed when the generator
+    finishes or is closed.
+    """
+    if memory_limit <= 0:
+        raise ValueError("memory_limit must be positive")
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+
+    # Only one chunk is alive at a time: each is spilled and dropped before
+    # the next one is read.
+    chunks = _sorted_chunks(records, key, memory_limit)
+    chunk, last = next(chunks, ((), True))
+    if last:
+        # Everything fit in memory; no need to touch the disk.
+        yield from chunk
+        return
+
+    with tempfile.TemporaryDirectory(prefix="external-sort-", dir=tmp_dir) as run_dir:
+        runs = [_write_run(chunk, run_dir)]
+        del chunk
+        for chunk, _ in chunks:
+            runs.append(_write_run(chunk, run_dir))
+            del chunk
+
+        # Merge adjacent groups so run order, and with it stability, is kept.
+        while len(runs) > fan_in:
+            merged = []
+            for i in range(0, len(runs), fan_in):
+                group = runs[i:i + fan_in]
+                if len(group) == 1:
+                    merged.append(group[0])
+                    continue
+                merged.append(_write_run(_merge_runs(group, key), run_dir))
+                for path in group:
+                    os.remove(path)
+            runs = merged
+
+        yield from _merge_runs(runs, key)
+
+
+def external_sort(input_path, output_path, key=None, memory_limit=DEFAULT_MEMORY_LIMIT,
+                  fan_in=DEFAULT_FAN_IN, tmp_dir=None):
+    """Sort the lines of the file at ``input_path`` into ``output_path``."""
+    with open(input_path, encoding="utf-8", newline="\n") as src, \
+            open(output_path, "w", encoding="utf-8", newline="\n") as dst:
+        dst.writelines(external_sorted(src, key=key, memory_limit=memory_limit,
+                                       fan_in=fan_in, tmp_dir=tmp_dir))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="file to sort, one record per line")
+    parser.add_argument("output", help="where to write the sorted records")
+    parser.add_argument("--memory-limit", type=int, default=DEFAULT_MEMORY_LIMIT,
+                        help="approximate bytes of records held in memory at once")
+    parser.add_argument("--fan-in", type=int, default=DEFAULT_FAN_IN,
+                        help="maximum number of runs merged at once")
+    parser.add_argument("--tmp-dir", default=None, help="directory for temporary run files")
+    args = parser.parse_args(argv)
+    external_sort(args.input, args.output, memory_limit=args.memory_limit,
+                  fan_in=args.fan_in, tmp_dir=args.tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,5 @@
-import importlib.util
-
-# Path to the .pyc file
-pyc_path = "../__encoded_files__/q2.encoded.pyc"
-
-
-# Load the .pyc file
-spec = importlib.util.spec_from_file_location("", pyc_path)
-module = importlib.util.module_from_spec(spec)
-
-# Execute the module
-spec.loader.exec_module(module)
+# Load the q2 kernel
+from kernels import q2 as module
 
 result = module.parse_date("12/31/2021")
 print(result)
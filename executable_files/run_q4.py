@@ -1,15 +1,5 @@
-import importlib.util
-
-# Path to the .pyc file
-pyc_path = "../__encoded_files__/q4.encoded.pyc"
-
-
-# Load the .pyc file
-spec = importlib.util.spec_from_file_location("", pyc_path)
-module = importlib.util.module_from_spec(spec)
-
-# Execute the module
-spec.loader.exec_module(module)
+# Load the q4 kernel
+from kernels import q4 as module
 
 # Define the function to be cached, you cab use any function here
 def expensive_function(x, y):
@@ -0,0 +1,198 @@
+"""Sorted container that is kept in order incrementally.
+
+``SortedList`` replaces the pattern of appending new values to a list,
+re-sorting the whole list and then running ``binary_search`` on it.  Values
+are stored in a list of sorted blocks of roughly ``load`` items each (like
+the leaves of a B+-tree) together with the last value of every block, so
+``add``, ``remove`` and lookups bisect the block maxima and then one block
+instead of touching the whole list.  ``update`` sorts a batch with
+``adaptive_merge_sort.merge_sort`` and either inserts it value by value or,
+for large batches, merges it with the existing values in one linear pass
+(``heapq.merge``).
+
+``binary_search(target)`` has the same contract as the q3 kernel: it returns
+an index ``i`` with ``sl[i] == target``, or ``-1`` when ``target`` is absent.
+"""
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from itertools import accumulate, chain
+
+from adaptive_merge_sort import merge_sort
+
+DEFAULT_LOAD = 1000
+
+
+class SortedList:
+    """A list that keeps its values in ascending order."""
+
+    def __init__(self, iterable=(), load=DEFAULT_LOAD):
+        if load < 4:
+            raise ValueError("load must be at least 4")
+        self._load = load
+        self._len = 0
+        self._lists = []
+        self._maxes = []
+        # Start position of each block; rebuilt lazily after modifications.
+        self._offsets = None
+        self.update(iterable)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return chain.from_iterable(self._lists)
+
+    def __contains__(self, value):
+        return self.binary_search(value) != -1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        pos, i = self._locate(index)
+        return self._lists[pos][i]
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self)!r})"
+
+    def add(self, value):
+        """Insert ``value``, after any values equal to it."""
+        lists, maxes = self._lists, self._maxes
+        if not maxes:
+            lists.append([value])
+            maxes.append(value)
+        else:
+            pos = bisect_right(maxes, value)
+            if pos == len(maxes):
+                pos -= 1
+                lists[pos].append(value)
+                maxes[pos] = value
+            else:
+                insort(lists[pos], value)
+            self._split_if_full(pos)
+        self._len += 1
+        self._offsets = None
+
+    def update(self, iterable):
+        """Insert every value of ``iterable``."""
+        values = list(iterable)
+        if not values:
+            return
+        merge_sort(values)
+        if len(values) * 4 < self._len:
+            # A small sorted batch lands in a few neighbouring blocks.
+            for value in values:
+                self.add(value)
+            return
+        # heapq.merge takes from the first input on ties, so existing values
+        # stay ahead of equal new ones.
+        merged = list(heapq.merge(self, values))
+        load = self._load
+        self._lists = [merged[i:i + load] for i in range(0, len(merged), load)]
+        self._maxes = [block[-1] for block in self._lists]
+        self._len = len(merged)
+        self._offsets = None
+
+    def remove(self, value):
+        """Remove one occurrence of ``value``; raise ValueError if it is absent."""
+        if not self.discard(value):
+            raise ValueError(f"{value!r} not in {type(self).__name__}")
+
+    def discard(self, value):
+        """Remove one occurrence of ``value`` if present and return whether it was."""
+        maxes = self._maxes
+        pos = bisect_left(maxes, value)
+        if pos == len(maxes):
+            return False
+        block = self._lists[pos]
+        i = bisect_left(block, value)
+        if block[i] != value:
+            return False
+        self._delete(pos, i)
+        return True
+
+    def pop(self, index=-1):
+        """Remove and return the value at ``index`` (the largest by default)."""
+        pos, i = self._locate(index)
+        value = self._lists[pos][i]
+        self._delete(pos, i)
+        return value
+
+    def bisect_left(self, value):
+        """Return the index of the first value not less than ``value``."""
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return self._len
+        return self._block_offsets()[pos] + bisect_left(self._lists[pos], value)
+
+    def bisect_right(self, value):
+        """Return the index just past the last value not greater than ``value``."""
+        pos = bisect_right(self._maxes, value)
+        if pos == len(self._maxes):
+            return self._len
+        return self._block_offsets()[pos] + bisect_right(self._lists[pos], value)
+
+    def binary_search(self, target):
+        """Return an index holding ``target``, or -1 if it is not present."""
+        pos = bisect_left(self._maxes, target)
+        if pos == len(self._maxes):
+            return -1
+        block = self._lists[pos]
+        i = bisect_left(block, target)
+        if block[i] != target:
+            return -1
+        return self._block_offsets()[pos] + i
+
+    def index(self, value):
+        """Return the index of the first occurrence of ``value``; raise ValueError if absent."""
+        i = self.binary_search(value)
+        if i == -1:
+            raise ValueError(f"{value!r} not in {type(self).__name__}")
+        return i
+
+    def _block_offsets(self):
+        if self._offsets is None:
+            self._offsets = [0, *accumulate(len(block) for block in self._lists[:-1])]
+        return self._offsets
+
+    def _locate(self, index):
+        """Return the (block, position in block) of the value at ``index``."""
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError(f"{type(self).__name__} index out of range")
+        offsets = self._block_offsets()
+        pos = bisect_right(offsets, index) - 1
+        return pos, index - offsets[pos]
+
+    def _split_if_full(self, pos):
+        lists, maxes = self._lists, self._maxes
+        block = lists[pos]
+        if len(block) > 2 * self._load:
+            half = block[self._load:]
+            del block[self._load:]
+            maxes[pos] = block[-1]
+            lists.insert(pos + 1, half)
+            maxes.insert(pos + 1, half[-1])
+
+    def _delete(self, pos, i):
+        lists, maxes = self._lists, self._maxes
+        block = lists[pos]
+        del block[i]
+        self._len -= 1
+        self._offsets = None
+        if len(block) > self._load // 2:
+            maxes[pos] = block[-1]
+        elif len(lists) > 1:
+            # Fold an underfull block into its neighbour so blocks stay large.
+            if pos == 0:
+                pos = 1
+            lists[pos - 1].extend(lists[pos])
+            maxes[pos - 1] = lists[pos - 1][-1]
+            del lists[pos]
+            del maxes[pos]
+            self._split_if_full(pos - 1)
+        elif block:
+            maxes[pos] = block[-1]
+        else:
+            del lists[pos]
+            del maxes[pos]
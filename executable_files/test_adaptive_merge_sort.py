@@ -0,0 +1,247 @@
+import random
+
+import pytest
+from hypothesis import given, strategies as st, settings
+
+import adaptive_merge_sort as module
+
+
+# Wrapper that orders by key only and counts comparisons
+class Counted:
+    comparisons = 0
+
+    def __init__(self, key, tag=None):
+        self.key = key
+        self.tag = tag
+
+    def __lt__(self, other):
+        Counted.comparisons += 1
+        return self.key < other.key
+
+
+# Wrapper whose comparison raises after a given number of calls
+class Failing:
+    calls_left = 0
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        Failing.calls_left -= 1
+        if Failing.calls_left < 0:
+            raise RuntimeError("comparison failed")
+        return self.key < other.key
+
+
+# Test: Sorting a random list of integers
+@given(arr=st.lists(st.integers()))
+def test_merge_sort_correctness(arr):
+    expected = sorted(arr)
+    original = arr.copy()
+    module.merge_sort(arr)
+    assert arr == expected, f'Expected {expected} for result, but got {arr}. input arr is {original}'
+
+# Test: Sorting larger lists exercises run merging and galloping
+@given(arr=st.lists(st.integers(min_value=-50, max_value=50), min_size=64, max_size=600))
+def test_merge_sort_large_lists(arr):
+    expected = sorted(arr)
+    module.merge_sort(arr)
+    assert arr == expected
+
+# Test: Sorting a list made of several sorted and reverse sorted chunks
+@given(chunks=st.lists(st.tuples(st.lists(st.integers(), max_size=80), st.booleans()), min_size=1, max_size=10))
+def test_merge_sort_presorted_chunks(chunks):
+    arr = [x for chunk, descending in chunks for x in sorted(chunk, reverse=descending)]
+    expected = sorted(arr)
+    module.merge_sort(arr)
+    assert arr == expected
+
+# Test: Equal keys keep their original relative order
+@given(keys=st.lists(st.integers(min_value=0, max_value=5), max_size=300))
+def test_merge_sort_is_stable(keys):
+    arr = [Counted(key, tag) for tag, key in enumerate(keys)]
+    module.merge_sort(arr)
+    result = [(item.key, item.tag) for item in arr]
+    assert result == sorted((key, tag) for tag, key in enumerate(keys))
+
+# Test: Sorting an already sorted list takes a single linear pass
+@given(arr=st.lists(st.integers(), min_size=1, max_size=500).map(sorted))
+def test_already_sorted_is_linear(arr):
+    items = [Counted(x) for x in arr]
+    Counted.comparisons = 0
+    module.merge_sort(items)
+    assert [item.key for item in items] == arr
+    assert Counted.comparisons == len(arr) - 1
+
+# Test: Sorting a strictly descending list takes a single linear pass
+@given(arr=st.sets(st.integers(), min_size=1, max_size=500).map(lambda x: sorted(x, reverse=True)))
+def test_strictly_descending_is_linear(arr):
+    items = [Counted(x) for x in arr]
+    Counted.comparisons = 0
+    module.merge_sort(items)
+    assert [item.key for item in items] == arr[::-1]
+    assert Counted.comparisons == len(arr) - 1
+
+# Test: Sorting a reverse sorted list
+@given(arr=st.lists(st.integers(), min_size=1).map(lambda x: sorted(x, reverse=True)))
+def test_reverse_sorted(arr):
+    expected = sorted(arr)
+    module.merge_sort(arr)
+    assert arr == expected
+
+# Test: Sorting a list containing floating-point numbers
+@given(arr=st.lists(st.floats(allow_nan=False, allow_infinity=False)))
+def test_merge_sort_with_floats(arr):
+    expected = sorted(arr)
+    module.merge_sort(arr)
+    assert arr == expected
+
+# Test: Sorting an empty list
+def test_empty_list():
+    arr = []
+    assert module.merge_sort(arr) is None
+    assert arr == []
+
+# Test: Sorting a list with mixed data types raises an error
+@given(ints=st.lists(st.integers(), min_size=1), texts=st.lists(st.text(), min_size=1))
+def test_merge_sort_mixed_types(ints, texts):
+    with pytest.raises(TypeError):
+        module.merge_sort(ints + texts)
+
+# Test: A comparison that raises mid-sort leaves every item in the list once
+@pytest.mark.parametrize("keyed", [False, True])
+def test_failed_comparison_keeps_a_permutation(keyed):
+    rng = random.Random(210)
+    for _ in range(100):
+        arr = [Failing(rng.randrange(100)) for _ in range(rng.randrange(64, 1000))]
+        original = list(arr)
+        Failing.calls_left = rng.randrange(len(arr) * 8)
+        try:
+            module.merge_sort(arr, key=(lambda item: item) if keyed else None)
+        except RuntimeError:
+            pass
+        assert sorted(map(id, arr)) == sorted(map(id, original))
+
+# Test: Key function is called once per element and keeps equal keys stable
+@given(arr=st.lists(st.tuples(st.integers(min_value=0, max_value=5), st.text(max_size=3))))
+def test_merge_sort_with_key(arr):
+    calls = []
+    def key(item):
+        calls.append(item)
+        return item[0]
+    expected = sorted(arr, key=lambda item: item[0])
+    module.merge_sort(arr, key=key)
+    assert arr == expected
+    assert len(calls) == len(arr) or len(arr) < 2
+
+# Test: Reverse sorting matches sorted(reverse=True), including stability
+@given(arr=st.lists(st.tuples(st.integers(min_value=0, max_value=5), st.integers())))
+def test_merge_sort_reverse(arr):
+    expected = sorted(arr, key=lambda item: item[0], reverse=True)
+    module.merge_sort(arr, key=lambda item: item[0], reverse=True)
+    assert arr == expected
+
+# Test: Typed int and float inputs large enough for the radix fast path
+@given(arr=st.one_of(
+    st.lists(st.integers(min_value=-1000, max_value=1000), min_size=module.MIN_RADIX, max_size=2000),
+    st.lists(st.integers(), min_size=module.MIN_RADIX, max_size=2000),
+    st.lists(st.floats(allow_nan=False), min_size=module.MIN_RADIX, max_size=2000),
+), reverse=st.booleans())
+def test_merge_sort_typed_fast_path(arr, reverse):
+    expected = sorted(arr, reverse=reverse)
+    module.merge_sort(arr, reverse=reverse)
+    assert [repr(x) for x in arr] == [repr(x) for x in expected]
+
+# Test: Typed keys use the radix fast path and stay stable
+@given(arr=st.lists(st.tuples(st.integers(min_value=0, max_value=9), st.integers()), min_size=module.MIN_RADIX, max_size=2000))
+def test_merge_sort_typed_keys(arr):
+    expected = sorted(arr, key=lambda item: float(item[0]))
+    module.merge_sort(arr, key=lambda item: float(item[0]))
+    assert arr == expected
+
+# Test: Large float lists take the radix fast path
+def test_radix_sort_floats():
+    rng = random.Random(210)
+    arr = [rng.uniform(-1e6, 1e6) for _ in range(5000)]
+    expected = sorted(arr)
+    assert module._radix_sort(arr, None)
+    assert arr == expected
+
+# Test: Signed zeros keep their input order in the float fast path
+def test_merge_sort_signed_zeros_are_stable():
+    arr = [0.0, -0.0, 1.0, -0.0, 0.0, -1.0] * 1000
+    expected = sorted(arr)
+    assert module._radix_sort(arr, None)
+    assert [repr(x) for x in arr] == [repr(x) for x in expected]
+
+# Test: A sorted list plus a short appended batch is merged, not radix sorted
+@pytest.mark.parametrize("number", [int, float])
+def test_nearly_sorted_skips_radix_sort(number):
+    rng = random.Random(210)
+    arr = [number(i) for i in range(20000)] + [number(rng.randrange(20000)) for _ in range(200)]
+    expected = sorted(arr)
+    assert not module._radix_sort(arr, None)
+    module.merge_sort(arr)
+    assert arr == expected
+
+# Strategy to generate inputs for the shared-memory and pickled parallel paths
+def parallel_input_strategy():
+    return st.one_of(
+        st.lists(st.integers(min_value=-2**63, max_value=2**63 - 1), max_size=300),
+        st.lists(st.floats(allow_nan=False), max_size=300),
+        st.lists(st.integers(), max_size=300),
+        st.lists(st.text(max_size=5), max_size=300),
+    )
+
+# Test: Parallel mode gives the same result as sorted()
+@settings(deadline=None, max_examples=15)
+@given(arr=parallel_input_strategy(), workers=st.integers(min_value=2, max_value=5))
+def test_parallel_merge_sort(arr, workers):
+    expected = sorted(arr)
+    original_chunk = module.MIN_PARALLEL_CHUNK
+    module.MIN_PARALLEL_CHUNK = 16
+    try:
+        module.merge_sort(arr, workers=workers)
+    finally:
+        module.MIN_PARALLEL_CHUNK = original_chunk
+    assert arr == expected
+
+# Test: Parallel mode keeps equal float keys (0.0 and -0.0) in input order
+def test_parallel_merge_sort_is_stable():
+    rng = random.Random(210)
+    arr = [rng.choice([0.0, -0.0, 1.5, -1.5]) for _ in range(1000)]
+    expected = sorted(arr)
+    original_chunk = module.MIN_PARALLEL_CHUNK
+    module.MIN_PARALLEL_CHUNK = 100
+    try:
+        module.merge_sort(arr, workers=4)
+    finally:
+        module.MIN_PARALLEL_CHUNK = original_chunk
+    assert [repr(x) for x in arr] == [repr(x) for x in expected]
+
+# Test: A shared buffer is released even if allocating the second one fails
+def test_parallel_shared_memory_is_released(monkeypatch):
+    created = []
+
+    class FailingSharedMemory(module.shared_memory.SharedMemory):
+        def __init__(self, *args, **kwargs):
+            if created:
+                raise OSError("out of shared memory")
+            super().__init__(*args, **kwargs)
+            created.append(self.name)
+
+    monkeypatch.setattr(module.shared_memory, "SharedMemory", FailingSharedMemory)
+    with pytest.raises(OSError):
+        module._parallel_sort_shared([3, 1, 2], "q", [0, 3], executor=None)
+    monkeypatch.undo()
+    with pytest.raises(FileNotFoundError):
+        module.shared_memory.SharedMemory(name=created[0])
+
+# Test: Invalid worker count raises an error
+def test_invalid_workers():
+    with pytest.raises(ValueError):
+        module.merge_sort([3, 1, 2], workers=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,103 @@
+import copy
+import json
+
+import pytest
+from hypothesis import strategies as st
+
+import benchmark
+
+
+def entry(p50):
+    return {"calls": 1, "errors": 0, "samples": 1, "batch": 1, "repeat": 1,
+            "ops_per_sec": 1e6 / p50, "peak_memory_bytes": 0,
+            "latency_us": {"min": p50, "p50": p50, "p90": p50, "p99": p50, "max": p50}}
+
+
+# Test: Examples drawn from a strategy are the same on every run
+def test_draw_examples_is_reproducible():
+    first = benchmark.draw_examples(st.integers(), count=20)
+    second = benchmark.draw_examples(st.integers(), count=20)
+    assert first == second
+    assert 0 < len(first) <= 20
+
+# Test: A measurement reports throughput, latency percentiles and peak memory
+@pytest.mark.parametrize("kernel", ["transpose", "lru_cache", "merge_sort"])
+def test_measure_reports_metrics(kernel):
+    result = benchmark.measure(kernel, 50, samples=5, sample_time=0.001)
+    assert result["samples"] == 5
+    assert result["calls"] == 5 * result["batch"]
+    assert result["ops_per_sec"] > 0
+    latency = result["latency_us"]
+    assert latency["min"] <= latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["max"]
+    assert result["peak_memory_bytes"] >= 0
+
+# Test: A kernel that does not finish is reported instead of hanging, even if it
+# catches every Exception
+def test_measure_times_out():
+    def hang(size, rng):
+        def spin():
+            while True:
+                try:
+                    pass
+                except Exception:
+                    pass
+        return spin, lambda: ()
+
+    benchmark.WORKLOADS["hang"] = hang
+    try:
+        result = benchmark.measure("hang", 1, samples=1, timeout=0.2)
+    finally:
+        del benchmark.WORKLOADS["hang"]
+    assert "timed out" in result["error"]
+
+# Test: The report is JSON serialisable, keyed by kernel and size, and combines the repeats
+def test_run_benchmarks_report(tmp_path):
+    report = benchmark.run_benchmarks(["merge_sort"], sizes=[10, 20], samples=2,
+                                      profile_dir=str(tmp_path), repeat=2, sample_time=0.001)
+    assert set(report["results"]["merge_sort"]) == {"10", "20"}
+    assert all(entry["repeat"] == 2 for entry in report["results"]["merge_sort"].values())
+    json.dumps(report)
+    assert (tmp_path / "merge_sort-10.prof").exists()
+    assert (tmp_path / "merge_sort-20.tracemalloc").exists()
+
+# Test: Repeated rounds keep the lowest median and add up calls and errors
+def test_best_round_keeps_lowest_median():
+    slow, fast = entry(10.0), entry(5.0)
+    fast["errors"] = 1
+    best = benchmark._best_round(benchmark._best_round(slow, fast), entry(7.0))
+    assert best["latency_us"]["p50"] == 5.0
+    assert (best["calls"], best["errors"], best["repeat"]) == (3, 1, 3)
+
+# Test: Baseline comparison flags slowdowns above the threshold, more errors and new failures
+def test_compare_flags_regressions():
+    baseline = {"results": {"merge_sort": {"100": entry(10.0), "1000": entry(100.0)},
+                            "transpose": {"100": entry(5.0)}}}
+    report = copy.deepcopy(baseline)
+    assert benchmark.compare(report, baseline, threshold=0.2) == []
+
+    report["results"]["merge_sort"]["100"] = entry(11.5)
+    assert benchmark.compare(report, baseline, threshold=0.2) == []
+    report["results"]["merge_sort"]["1000"] = entry(130.0)
+    report["results"]["transpose"]["100"] = {"error": "timed out after 10s"}
+    regressions = benchmark.compare(report, baseline, threshold=0.2)
+    assert len(regressions) == 2
+    report["results"]["merge_sort"]["100"]["errors"] = 1
+    regressions = benchmark.compare(report, baseline, threshold=0.2)
+    assert len(regressions) == 3
+    assert any("merge_sort at size 1000" in message for message in regressions)
+    assert any("timed out" in message for message in regressions)
+    assert any("merge_sort at size 100: errors 0/1 -> 1/1" in message for message in regressions)
+
+# Test: The command line exits non-zero on a regression
+def test_main_fails_on_regression(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": {"merge_sort": {"10": entry(1e-6)}}}))
+    output = tmp_path / "report.json"
+    status = benchmark.main(["--kernels", "merge_sort", "--sizes", "10", "--samples", "2",
+                             "--output", str(output), "--baseline", str(baseline)])
+    assert status == 1
+    assert "merge_sort" in json.loads(output.read_text())["results"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
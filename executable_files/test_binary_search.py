@@ -1,12 +1,8 @@
-import importlib.util
 from hypothesis import given, strategies as st, settings
 import pytest
 import signal
 
-pyc_path = "../__encoded_files__/q3.encoded.pyc"
-spec = importlib.util.spec_from_file_location("", pyc_path)
-module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(module)
+from kernels import q3 as module
 
 # Strategy to generate sorted lists of integers
 def sorted_list_strategy():
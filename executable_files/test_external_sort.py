@@ -0,0 +1,104 @@
+import random
+import tracemalloc
+
+import pytest
+from hypothesis import given, strategies as st, settings
+
+import external_sort as module
+
+# Strategy to generate newline-terminated records (lone surrogates included)
+def records_strategy():
+    return st.lists(
+        st.text(alphabet=st.characters(blacklist_characters="\r\n"), max_size=12).map(lambda s: s + "\n"),
+        max_size=200
+    )
+
+
+# Test: Output matches sorted() when everything fits in memory
+@given(records=records_strategy())
+def test_sorted_in_memory(records):
+    assert list(module.external_sorted(records)) == sorted(records)
+
+# Test: Output matches sorted() when runs are spilled to disk
+@settings(deadline=None, max_examples=30)
+@given(records=records_strategy(), memory_limit=st.integers(min_value=1, max_value=2000))
+def test_sorted_with_spilled_runs(records, memory_limit):
+    assert list(module.external_sorted(records, memory_limit=memory_limit)) == sorted(records)
+
+# Test: Records with lone surrogates survive a round trip through the run files
+@pytest.mark.parametrize("records", [["\n", "\ud800\n"], ["\udfff\n", "a\ud800b\n", "\n"]])
+def test_spilled_runs_keep_surrogates(records):
+    assert list(module.external_sorted(records, memory_limit=1, fan_in=2)) == sorted(records)
+
+# Test: Runs beyond the fan-in are merged in several passes
+@settings(deadline=None, max_examples=20)
+@given(records=records_strategy(), fan_in=st.integers(min_value=2, max_value=4))
+def test_sorted_with_multiple_merge_passes(records, fan_in):
+    result = module.external_sorted(records, memory_limit=1, fan_in=fan_in)
+    assert list(result) == sorted(records)
+
+# Test: Only one chunk of records is held in memory at a time
+def test_memory_stays_near_the_limit():
+    def records():
+        rng = random.Random(0)
+        for _ in range(20000):
+            yield f"{rng.randrange(10**12):012d}\n"
+
+    memory_limit = 200_000
+    tracemalloc.start()
+    try:
+        for _ in module.external_sorted(records(), memory_limit=memory_limit):
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 1.5 * memory_limit
+
+# Test: Key function is applied and equal keys keep their input order
+@settings(deadline=None, max_examples=30)
+@given(pairs=st.lists(st.tuples(st.integers(min_value=0, max_value=5), st.integers()), max_size=100))
+def test_key_function_is_stable(pairs):
+    records = [f"{k},{v}\n" for k, v in pairs]
+    key = lambda record: int(record.split(",")[0])
+    result = list(module.external_sorted(records, key=key, memory_limit=500, fan_in=3))
+    assert result == sorted(records, key=key)
+
+# Test: Large keys count against the memory budget
+def test_key_memory_is_counted():
+    records = [f"{i:03d}\n" for i in range(100)]
+    chunks = list(module._sorted_chunks(records, lambda record: record * 100, memory_limit=10_000))
+    assert len(chunks) > 5
+    assert [record for chunk, _ in chunks for record in chunk] == records
+
+# Test: Sorting a file, including a last line without a newline
+def test_external_sort_file(tmp_path):
+    src = tmp_path / "input.txt"
+    dst = tmp_path / "output.txt"
+    src.write_text("pear\napple\nfig\nbanana", encoding="utf-8")
+    module.external_sort(src, dst, memory_limit=100, tmp_dir=tmp_path)
+    assert dst.read_text(encoding="utf-8") == "apple\nbanana\nfig\npear\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["input.txt", "output.txt"]
+
+# Test: Only "\n" ends a record; a lone "\r" stays inside it
+@pytest.mark.parametrize("memory_limit", [1, 1000])
+def test_carriage_return_is_not_a_line_break(tmp_path, memory_limit):
+    src = tmp_path / "input.txt"
+    dst = tmp_path / "output.txt"
+    src.write_bytes(b"b\ra\nc\r\n")
+    module.external_sort(src, dst, memory_limit=memory_limit, tmp_dir=tmp_path)
+    assert dst.read_bytes() == b"b\ra\nc\r\n"
+
+# Test: Only the last record may lack its newline
+def test_unterminated_record_before_the_end():
+    assert list(module.external_sorted(["b\n", "a"])) == ["a\n", "b\n"]
+    with pytest.raises(ValueError):
+        list(module.external_sorted(["b", "a\n"]))
+
+# Test: Invalid memory budget raises an error
+def test_invalid_memory_limit():
+    with pytest.raises(ValueError):
+        list(module.external_sorted(["a\n"], memory_limit=0))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
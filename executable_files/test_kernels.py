@@ -0,0 +1,51 @@
+import importlib.util
+import os
+
+import pytest
+
+import kernels
+
+
+# Test: Every kernel loads and provides its function
+@pytest.mark.parametrize("name, function", sorted(kernels.KERNELS.items()))
+def test_kernel_provides_function(name, function):
+    module = kernels.load(name)
+    assert callable(getattr(module, function))
+    assert getattr(kernels, function) is getattr(module, function)
+
+# Test: Kernels are loaded once and cached for the process
+def test_kernels_are_cached():
+    assert kernels.q5 is kernels.load("q5")
+    assert kernels.load("q5") is kernels.load("q5")
+    from kernels import q5 as module
+    assert module is kernels.q5
+
+# Test: Paths do not depend on the working directory
+def test_kernel_path_is_absolute(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = kernels.kernel_path("q1")
+    assert os.path.isabs(path)
+    assert os.path.isfile(path)
+
+# Test: Unknown attributes raise AttributeError
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        kernels.q6
+
+# Test: A pyc compiled for another Python version is rejected
+def test_wrong_magic_number(tmp_path):
+    path = tmp_path / "q9.encoded.pyc"
+    path.write_bytes(b"\x00\x00\r\n" + bytes(12))
+    with pytest.raises(ImportError):
+        kernels._read_pyc(str(path))
+    path.write_bytes(importlib.util.MAGIC_NUMBER + bytes(12))
+    assert kernels._read_pyc(str(path))[:4] == importlib.util.MAGIC_NUMBER
+
+# Test: A missing pyc is reported as an ImportError
+def test_missing_pyc(tmp_path):
+    with pytest.raises(ImportError):
+        kernels._read_pyc(str(tmp_path / "missing.pyc"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
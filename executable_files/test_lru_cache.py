@@ -1,12 +1,7 @@
-import importlib.util
 import pytest
 from hypothesis import given, strategies as st, settings
 
-pyc_path = "../__encoded_files__/q4.encoded.pyc"
-
-spec = importlib.util.spec_from_file_location("", pyc_path)
-module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(module)
+from kernels import q4 as module
 
 def expensive_function(x, y):
     print(f"Computing {x} + {y}")
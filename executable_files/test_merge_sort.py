@@ -1,12 +1,7 @@
-import importlib.util
 import pytest
 from hypothesis import given, strategies as st, settings
 
-pyc_path = "../__encoded_files__/q5.encoded.pyc"
-
-spec = importlib.util.spec_from_file_location("", pyc_path)
-module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(module)
+from kernels import q5 as module
 
 
 # Test: Sorting a random list of integers
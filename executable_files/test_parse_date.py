@@ -1,15 +1,9 @@
-import importlib.util
 from hypothesis import given, strategies as st
 from datetime import date
 import pytest
 from dateutil.parser import parse
 
-
-
-pyc_path = "../__encoded_files__/q2.encoded.pyc"
-spec = importlib.util.spec_from_file_location("", pyc_path)
-module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(module)
+from kernels import q2 as module
 
 # Strategy to generate valid dates
 def valid_date_strategy():
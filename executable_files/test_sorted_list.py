@@ -0,0 +1,101 @@
+import bisect
+
+import pytest
+from hypothesis import given, strategies as st
+
+from sorted_list import SortedList
+
+# Strategy to generate a sequence of operations against the container
+def operations_strategy():
+    value = st.integers(min_value=-50, max_value=50)
+    return st.lists(st.one_of(
+        st.tuples(st.just("add"), value),
+        st.tuples(st.just("discard"), value),
+        st.tuples(st.just("update"), st.lists(value, max_size=40)),
+        st.tuples(st.just("pop"), st.integers()),
+    ), max_size=80)
+
+
+# Test: Any mix of operations keeps the values sorted and indexable
+@given(initial=st.lists(st.integers(min_value=-50, max_value=50)), operations=operations_strategy())
+def test_operations_match_sorted_list(initial, operations):
+    container = SortedList(initial, load=4)
+    model = sorted(initial)
+    for name, argument in operations:
+        if name == "add":
+            container.add(argument)
+            model.append(argument)
+            model.sort()
+        elif name == "discard":
+            assert container.discard(argument) == (argument in model)
+            if argument in model:
+                model.remove(argument)
+        elif name == "update":
+            container.update(argument)
+            model = sorted(model + argument)
+        elif model:
+            index = argument % len(model)
+            assert container.pop(index) == model.pop(index)
+        assert list(container) == model
+        assert len(container) == len(model)
+    assert [container[i] for i in range(len(model))] == model
+
+# Test: binary_search follows the binary_search contract
+@given(array=st.lists(st.integers(min_value=1, max_value=1000), max_size=300), target=st.integers(min_value=1, max_value=1000))
+def test_binary_search_contract(array, target):
+    container = SortedList(array, load=8)
+    result = container.binary_search(target)
+    if target in array:
+        assert container[result] == target
+        assert result == sorted(array).index(target)
+    else:
+        assert result == -1
+    assert (target in container) == (target in array)
+
+# Test: bisect_left and bisect_right agree with the bisect module
+@given(array=st.lists(st.integers(min_value=-20, max_value=20), max_size=200), value=st.integers(min_value=-25, max_value=25))
+def test_bisect_positions(array, value):
+    container = SortedList(array, load=4)
+    model = sorted(array)
+    assert container.bisect_left(value) == bisect.bisect_left(model, value)
+    assert container.bisect_right(value) == bisect.bisect_right(model, value)
+
+# Test: Blocks split and merge so none grows past twice the load
+@given(values=st.lists(st.integers(), min_size=1, max_size=500))
+def test_block_sizes_stay_bounded(values):
+    container = SortedList(load=4)
+    for value in values:
+        container.add(value)
+    assert all(len(block) <= 8 for block in container._lists)
+    for value in values[::2]:
+        container.remove(value)
+    assert all(0 < len(block) <= 8 for block in container._lists)
+    assert list(container) == sorted(values[1::2])
+
+# Test: A large update keeps existing values ahead of equal new ones
+def test_update_is_stable():
+    container = SortedList([1, 2], load=4)
+    container.update([2.0, 0.0, 1.0])
+    assert [repr(value) for value in container] == ["0.0", "1", "1.0", "2", "2.0"]
+
+# Test: Removing a missing value raises an error
+def test_remove_missing_value():
+    container = SortedList([1, 2, 3])
+    with pytest.raises(ValueError):
+        container.remove(4)
+    with pytest.raises(ValueError):
+        container.index(4)
+
+# Test: Indexing past the end raises an error
+def test_index_out_of_range():
+    container = SortedList([1, 2, 3])
+    assert container[-1] == 3
+    assert container[0:2] == [1, 2]
+    with pytest.raises(IndexError):
+        container[3]
+    with pytest.raises(IndexError):
+        SortedList().pop()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -1,12 +1,8 @@
-import importlib.util
 from hypothesis import given, strategies as st, settings
 from hypothesis.strategies import lists, integers, one_of
 import pytest
 
-pyc_path = "../__encoded_files__/q1.encoded.pyc"
-spec = importlib.util.spec_from_file_location("", pyc_path)
-module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(module)
+from kernels import q1 as module
 
 # Hypothesis strategy to generate matrices of variable sizes
 def fixed_3x3_matrix_strategy():